@@ -0,0 +1,93 @@
+import asyncio
+import functools
+import random
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: grows by ~1 per window on success, halves once per window on overload."""
+
+    def __init__(self, max_concurrency: int, min_concurrency: int = 1, initial_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self.in_flight = 0
+        # 감소할 때마다 증가; 마지막 감소 이전에 시작된 호출의 overload는 다시 반영하지 않음
+        self._generation = 0
+        self._waiters = deque()
+
+    async def acquire(self) -> int:
+        """Wait for a free slot; returns the generation token to pass back to release()."""
+        while self.in_flight >= int(self.limit):
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    # 깨워졌지만 슬롯을 쓰지 않으므로 다음 대기자에게 넘김
+                    self._wake()
+                else:
+                    # _wake()가 이미 꺼냈을 수 있음
+                    try:
+                        self._waiters.remove(fut)
+                    except ValueError:
+                        pass
+                raise
+        self.in_flight += 1
+        return self._generation
+
+    def release(self, token: int, overloaded: bool = False, adjust: bool = True):
+        """Give the slot back; with adjust=False the limit is left unchanged."""
+        self.in_flight -= 1
+        if adjust:
+            if overloaded:
+                if token == self._generation:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self._generation += 1
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+
+def with_adaptive_retry(
+    max_concurrency: int,
+    overload_exception,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+    backoff_jitter: float = 1.0,
+):
+    """Run a coroutine under an AdaptiveLimiter, retrying overloads with jittered backoff."""
+    limiter = AdaptiveLimiter(max_concurrency)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                token = await limiter.acquire()
+                try:
+                    result = await func(*args, **kwargs)
+                except overload_exception:
+                    limiter.release(token, overloaded=True)
+                    if attempt == max_retries:
+                        raise
+                    await asyncio.sleep(backoff_factor * 2 ** attempt + random.uniform(0, backoff_jitter))
+                except BaseException:
+                    limiter.release(token, adjust=False)
+                    raise
+                else:
+                    limiter.release(token)
+                    return result
+
+        wrapper.limiter = limiter
+        return wrapper
+
+    return decorator
@@ -1,23 +1,80 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import BackgroundTasks, FastAPI, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+import logging
 import os
-import pandas as pd
-import requests
-import io
-import base64
+import time
+import httpx
+import orjson
 
-app = FastAPI()
+from limiter import with_adaptive_retry
 
-# CORS: 프론트(별도 도메인)에서 호출 가능하게
+SENDGRID_URL = "https://api.sendgrid.com/v3/mail/send"
+
+logger = logging.getLogger("fineplay-apply")
+
+# 환경변수는 기동 시 한 번만 읽음
+API_KEY = os.environ.get("SENDGRID_API_KEY")
+FROM_EMAIL = os.environ.get("SENDGRID_FROM_EMAIL", "no-reply@fineplay.kr")
+OPS_EMAIL = os.environ.get("OPS_EMAIL", "official@fineplay.kr")
+AUTH_HEADERS = {"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"}
+
+# SendGrid 호출용 공용 클라이언트 (HTTP/2 + keep-alive 커넥션 재사용) - lifespan에서 생성/종료
+CLIENT: Optional[httpx.AsyncClient] = None
+
+
+class SendGridOverload(RuntimeError):
+    """SendGrid answered 429/5xx or the request never left the client; the call may be retried."""
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not API_KEY:
+        raise RuntimeError("SENDGRID_API_KEY is not set")
+    global CLIENT
+    CLIENT = httpx.AsyncClient(
+        http2=True,
+        timeout=20,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30),
+    )
+    try:
+        yield
+    finally:
+        await CLIENT.aclose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+SUMMARY_COLS = (
+    "created_at_utc",
+    "plan",
+    "match_date",
+    "kickoff_time",
+    "location",
+    "home_team",
+    "away_team",
+    "representative_name",
+    "representative_contact",
+    "video_url_1",
+    "video_url_2",
+    "formation",
+    "players_count",
+    "substitutes_count",
+    "total_count",
+)
+
+# CORS: 프론트(별도 도메인)에서 호출 가능하게 - 허용 도메인만 명시
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 배포 후엔 프론트 도메인으로 좁히는 걸 추천
+    allow_origins=["https://fineplay.kr", "https://www.fineplay.kr"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type"],
 )
 
 
@@ -29,12 +86,28 @@ def root():
 def health():
     return {"ok": True}
 
+MIN_PLAYERS_DETAIL = "최소 11명(선발) 입력이 필요합니다."
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # 인원 부족은 기존 계약대로 400 {"detail": "<메시지>"} 로 응답
+    for err in exc.errors():
+        if str(err.get("ctx", {}).get("error")) == MIN_PLAYERS_DETAIL:
+            return ORJSONResponse(status_code=400, content={"detail": MIN_PLAYERS_DETAIL})
+    return await request_validation_exception_handler(request, exc)
+
+
 class Player(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     name: str
     position: str
     number: str
 
 class Application(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     plan: str
     match_date: str
     kickoff_time: str
@@ -49,107 +122,97 @@ class Application(BaseModel):
     players: List[Player] = Field(default_factory=list)
     substitutes: List[Player] = Field(default_factory=list)
 
-def sendgrid_send_email(to_email: str, subject: str, content: str, attachments: list):
-    """Send email via SendGrid with multiple attachments.
-
-    attachments: list of dicts with keys: filename (str), data (bytes), type (mime type)
-    """
-    api_key = os.environ.get("SENDGRID_API_KEY")
-    from_email = os.environ.get("SENDGRID_FROM_EMAIL", "no-reply@fineplay.kr")
-    if not api_key:
-        raise RuntimeError("SENDGRID_API_KEY is not set")
-
-    sg_attachments = []
-    for att in attachments:
-        encoded = base64.b64encode(att["data"]).decode("utf-8")
-        sg_attachments.append({
-            "content": encoded,
-            "type": att.get("type", "application/octet-stream"),
-            "filename": att.get("filename", "attachment"),
-            "disposition": "attachment",
-        })
+    # 최소 요구조건(원하시는 정책에 맞춰 조정 가능) - 핸들러 진입 전에 거절
+    @model_validator(mode="after")
+    def _min_players(self):
+        if len(self.players) + len(self.substitutes) < 11:
+            raise ValueError(MIN_PLAYERS_DETAIL)
+        return self
 
+async def sendgrid_send_email(to_email: str, subject: str, content: str):
+    """Send a plain-text email via SendGrid."""
     payload = {
         "personalizations": [{"to": [{"email": to_email}]}],
-        "from": {"email": from_email},
+        "from": {"email": FROM_EMAIL},
         "subject": subject,
         "content": [{"type": "text/plain", "value": content}],
-        "attachments": sg_attachments,
     }
 
-    r = requests.post(
-        "https://api.sendgrid.com/v3/mail/send",
-        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-        json=payload,
-        timeout=20,
-    )
+    await _post_sendgrid(orjson.dumps(payload))
+
+
+@with_adaptive_retry(max_concurrency=64, overload_exception=SendGridOverload)
+async def _post_sendgrid(body: bytes):
+    if CLIENT is None:
+        raise RuntimeError("SendGrid client not initialised; app lifespan not running")
+    try:
+        r = await CLIENT.post(
+            SENDGRID_URL,
+            headers=AUTH_HEADERS,
+            content=body,
+        )
+    except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+        # 요청이 전송되기 전의 연결 오류만 과부하로 취급(재시도 가능).
+        # ReadTimeout 등은 SendGrid가 이미 접수했을 수 있어 중복 발송 방지를 위해 재시도하지 않음
+        raise SendGridOverload(f"SendGrid connection error: {e!r}") from e
+    if r.status_code == 429 or r.status_code >= 500:
+        raise SendGridOverload(f"SendGrid overloaded: {r.status_code} {r.text}")
     if r.status_code not in (200, 202):
         raise RuntimeError(f"SendGrid error: {r.status_code} {r.text}")
 
-@app.get("/health")
-def health():
-    return {"ok": True}
-
-@app.post("/submit-application")
-def submit_application(data: Application):
-    # 최소 요구조건(원하시는 정책에 맞춰 조정 가능)
+async def send_application_email(to_email: str, subject: str, content: str):
+    """Background send: on final failure, log the full message so ops can recover the application."""
+    try:
+        await sendgrid_send_email(to_email=to_email, subject=subject, content=content)
+    except Exception:
+        logger.exception(
+            "Failed to send application email to %s; subject=%r body:\n%s",
+            to_email,
+            subject,
+            content,
+        )
+
+
+@app.post("/submit-application", status_code=202)
+async def submit_application(data: Application, bg: BackgroundTasks):
     total_players = len(data.players) + len(data.substitutes)
-    if total_players < 11:
-        raise HTTPException(status_code=400, detail="최소 11명(선발) 입력이 필요합니다.")
-
-    # 파일명 및 CSV 생성 (Excel 대신 CSV로 전송하여 속도 개선)
-    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    safe_home = (data.home_team or "HOME").replace("/", "_")
-    summary_filename = f"fineplay_application_summary_{safe_home}_{ts}.csv"
-    players_filename = f"fineplay_application_players_{safe_home}_{ts}.csv"
-
-    # Summary CSV
-    summary_df = pd.DataFrame([
-        {
-            "created_at_utc": ts,
-            "plan": data.plan,
-            "match_date": data.match_date,
-            "kickoff_time": data.kickoff_time,
-            "location": data.location,
-            "home_team": data.home_team,
-            "away_team": data.away_team,
-            "representative_name": data.representative_name,
-            "representative_contact": data.representative_contact,
-            "video_url_1": data.video_url_1,
-            "video_url_2": data.video_url_2,
-            "formation": data.formation,
-            "players_count": len(data.players),
-            "substitutes_count": len(data.substitutes),
-            "total_count": total_players,
-        }
-    ])
-
-    # Players CSV
-    player_rows = []
-    for p in data.players:
-        player_rows.append({"type": "starter", "name": p.name, "position": p.position, "number": p.number})
-    for p in data.substitutes:
-        player_rows.append({"type": "sub", "name": p.name, "position": p.position, "number": p.number})
-    players_df = pd.DataFrame(player_rows)
-
-    # Convert to CSV bytes (UTF-8 with BOM for Excel compatibility)
-    summary_csv = summary_df.to_csv(index=False, encoding="utf-8-sig")
-    players_csv = players_df.to_csv(index=False, encoding="utf-8-sig")
-    summary_bytes = summary_csv.encode("utf-8-sig")
-    players_bytes = players_csv.encode("utf-8-sig")
-
-    # 이메일 전송 (두 개의 CSV 첨부)
-    to_email = os.environ.get("OPS_EMAIL", "official@fineplay.kr")
-    attachments = [
-        {"filename": summary_filename, "data": summary_bytes, "type": "text/csv"},
-        {"filename": players_filename, "data": players_bytes, "type": "text/csv"},
-    ]
-
-    sendgrid_send_email(
+
+    t = time.gmtime()
+    ts = f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+
+    # 첨부파일 없이 신청 내용을 메일 본문(plain text)에 바로 기록
+    summary_row = (
+        ts,
+        data.plan,
+        data.match_date,
+        data.kickoff_time,
+        data.location,
+        data.home_team,
+        data.away_team,
+        data.representative_name,
+        data.representative_contact,
+        data.video_url_1,
+        data.video_url_2,
+        data.formation,
+        len(data.players),
+        len(data.substitutes),
+        total_players,
+    )
+    lines = ["신규 분석 신청이 접수되었습니다.", "", "=== Summary ==="]
+    lines += [f"{col}: {'' if val is None else val}" for col, val in zip(SUMMARY_COLS, summary_row)]
+    lines += ["", "=== Players ==="]
+    lines += [f"{p.number:>3} {p.position:<4} {p.name}" for p in data.players]
+    if data.substitutes:
+        lines += ["", "=== Substitutes ==="]
+        lines += [f"{p.number:>3} {p.position:<4} {p.name}" for p in data.substitutes]
+
+    # 이메일 전송 - 응답 후 백그라운드에서 발송
+    to_email = OPS_EMAIL
+    bg.add_task(
+        send_application_email,
         to_email=to_email,
         subject="[Fine Play] 신규 분석 신청 접수",
-        content="신규 분석 신청이 접수되었습니다. 첨부된 CSV 파일을 확인해주세요.",
-        attachments=attachments,
+        content="\n".join(lines),
     )
 
-    return {"status": "ok", "sent_to": to_email}
+    return {"status": "accepted", "sent_to": to_email}
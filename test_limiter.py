@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+from limiter import AdaptiveLimiter, with_adaptive_retry
+
+
+class Overload(Exception):
+    pass
+
+
+class AdaptiveLimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrency_bounded_by_limit(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=4)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            token = await limiter.acquire()
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0)
+            limiter.release(token, adjust=False)
+
+        await asyncio.gather(*(call() for _ in range(20)))
+        self.assertEqual(peak, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_success_grows_limit_up_to_max(self):
+        limiter = AdaptiveLimiter(max_concurrency=10, initial_concurrency=8)
+        for _ in range(8):
+            limiter.release(await limiter.acquire())
+        self.assertGreater(limiter.limit, 8.9)
+        for _ in range(100):
+            limiter.release(await limiter.acquire())
+        self.assertEqual(limiter.limit, 10)
+
+    async def test_overload_halves_once_per_window(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=8)
+        tokens = [await limiter.acquire() for _ in range(8)]
+        for token in tokens:
+            limiter.release(token, overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+        # 감소 이후에 시작된 호출의 overload는 다시 반영
+        limiter.release(await limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+    async def test_limit_never_below_min(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=2)
+        for _ in range(5):
+            limiter.release(await limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 1)
+
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=1)
+        token = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        limiter.release(token, adjust=False)
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(await limiter.acquire(), 0)
+
+    async def test_cancelled_waiter_popped_by_release_still_raises_cancelled(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=1)
+        token = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release(token, adjust=False)
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(len(limiter._waiters), 0)
+
+    async def test_woken_then_cancelled_waiter_passes_slot_on(self):
+        limiter = AdaptiveLimiter(max_concurrency=64, initial_concurrency=1)
+        token = await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release(token, adjust=False)
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, timeout=1)
+        self.assertEqual(limiter.in_flight, 1)
+
+
+class WithAdaptiveRetryTest(unittest.IsolatedAsyncioTestCase):
+    async def test_error_releases_slot_without_changing_limit(self):
+        @with_adaptive_retry(max_concurrency=64, overload_exception=Overload)
+        async def fail():
+            raise ValueError("boom")
+
+        for _ in range(50):
+            with self.assertRaises(ValueError):
+                await fail()
+        self.assertEqual(fail.limiter.limit, 8)
+        self.assertEqual(fail.limiter.in_flight, 0)
+
+    async def test_cancellation_releases_slot(self):
+        @with_adaptive_retry(max_concurrency=64, overload_exception=Overload)
+        async def slow():
+            await asyncio.sleep(10)
+
+        task = asyncio.create_task(slow())
+        await asyncio.sleep(0)
+        self.assertEqual(slow.limiter.in_flight, 1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(slow.limiter.in_flight, 0)
+        self.assertEqual(slow.limiter.limit, 8)
+
+    async def test_overload_retried_then_raised(self):
+        calls = 0
+
+        @with_adaptive_retry(
+            max_concurrency=64, overload_exception=Overload, max_retries=2, backoff_factor=0, backoff_jitter=0
+        )
+        async def overloaded():
+            nonlocal calls
+            calls += 1
+            raise Overload()
+
+        with self.assertRaises(Overload):
+            await overloaded()
+        self.assertEqual(calls, 3)
+        self.assertEqual(overloaded.limiter.in_flight, 0)
+        self.assertEqual(overloaded.limiter.limit, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
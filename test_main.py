@@ -0,0 +1,147 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SENDGRID_API_KEY", "test-key")
+
+import httpx
+import orjson
+from fastapi.testclient import TestClient
+
+import main
+
+FIXED_TIME = time.struct_time((2026, 3, 7, 9, 5, 2, 5, 66, 0))
+
+
+def make_application(**overrides):
+    data = {
+        "plan": "basic",
+        "match_date": "2026-03-07",
+        "kickoff_time": "18:00",
+        "location": "Seoul",
+        "home_team": "FC Home",
+        "away_team": "FC Away",
+        "representative_name": "Kim",
+        "representative_contact": "010-0000-0000",
+        "video_url_1": "https://example.com/1",
+        "video_url_2": "",
+        "formation": "4-4-2",
+        "players": [{"name": f"P{i}", "position": "MF", "number": str(i)} for i in range(1, 12)],
+        "substitutes": [{"name": "S1", "position": "GK", "number": "12"}],
+    }
+    data.update(overrides)
+    return data
+
+
+class SubmitApplicationTest(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.sendgrid_status = 202
+
+        def handler(request: httpx.Request):
+            self.sent.append(request)
+            return httpx.Response(self.sendgrid_status)
+
+        patcher = mock.patch.object(main, "CLIENT", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def post(self, data):
+        with mock.patch("main.time.gmtime", return_value=FIXED_TIME):
+            return self.client.post("/submit-application", json=data)
+
+    def sent_body(self):
+        self.assertEqual(len(self.sent), 1)
+        return orjson.loads(self.sent[0].content)
+
+    def test_accepted_and_email_sent(self):
+        r = self.post(make_application())
+        self.assertEqual(r.status_code, 202)
+        self.assertEqual(r.json(), {"status": "accepted", "sent_to": main.OPS_EMAIL})
+
+        self.assertEqual(self.sent[0].headers["Authorization"], f"Bearer {main.API_KEY}")
+        body = self.sent_body()
+        self.assertEqual(body["personalizations"], [{"to": [{"email": main.OPS_EMAIL}]}])
+        self.assertEqual(body["from"], {"email": main.FROM_EMAIL})
+        self.assertEqual(body["subject"], "[Fine Play] 신규 분석 신청 접수")
+        self.assertNotIn("attachments", body)
+
+        players = "\n".join(f"{i:>3} MF   P{i}" for i in range(1, 12))
+        expected = (
+            "신규 분석 신청이 접수되었습니다.\n"
+            "\n"
+            "=== Summary ===\n"
+            "created_at_utc: 20260307_090502\n"
+            "plan: basic\n"
+            "match_date: 2026-03-07\n"
+            "kickoff_time: 18:00\n"
+            "location: Seoul\n"
+            "home_team: FC Home\n"
+            "away_team: FC Away\n"
+            "representative_name: Kim\n"
+            "representative_contact: 010-0000-0000\n"
+            "video_url_1: https://example.com/1\n"
+            "video_url_2: \n"
+            "formation: 4-4-2\n"
+            "players_count: 11\n"
+            "substitutes_count: 1\n"
+            "total_count: 12\n"
+            "\n"
+            "=== Players ===\n"
+            f"{players}\n"
+            "\n"
+            "=== Substitutes ===\n"
+            " 12 GK   S1"
+        )
+        self.assertEqual(body["content"], [{"type": "text/plain", "value": expected}])
+
+    def test_null_optional_fields_are_blank(self):
+        r = self.post(make_application(representative_name=None, representative_contact=None))
+        self.assertEqual(r.status_code, 202)
+        content = self.sent_body()["content"][0]["value"]
+        self.assertIn("\nrepresentative_name: \n", content)
+        self.assertIn("\nrepresentative_contact: \n", content)
+        self.assertNotIn("None", content)
+
+    def test_substitutes_section_omitted_when_empty(self):
+        r = self.post(make_application(substitutes=[]))
+        self.assertEqual(r.status_code, 202)
+        content = self.sent_body()["content"][0]["value"]
+        self.assertNotIn("=== Substitutes ===", content)
+        self.assertTrue(content.endswith(" 11 MF   P11"))
+
+    def test_too_few_players_rejected_with_400(self):
+        r = self.post(make_application(players=[], substitutes=[]))
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json(), {"detail": main.MIN_PLAYERS_DETAIL})
+        self.assertEqual(self.sent, [])
+
+    def test_unknown_field_rejected_with_422(self):
+        r = self.post(make_application(unexpected="x"))
+        self.assertEqual(r.status_code, 422)
+        self.assertEqual(r.json()["detail"][0]["type"], "extra_forbidden")
+        self.assertEqual(self.sent, [])
+
+    def test_unknown_player_field_rejected_with_422(self):
+        players = make_application()["players"]
+        players[0]["age"] = 20
+        r = self.post(make_application(players=players))
+        self.assertEqual(r.status_code, 422)
+        self.assertEqual(self.sent, [])
+
+    def test_send_failure_is_logged_with_body(self):
+        self.sendgrid_status = 400
+        with self.assertLogs("fineplay-apply", level="ERROR") as logs:
+            r = self.post(make_application())
+        self.assertEqual(r.status_code, 202)
+        self.assertEqual(len(self.sent), 1)
+        output = "\n".join(logs.output)
+        self.assertIn("[Fine Play] 신규 분석 신청 접수", output)
+        self.assertIn("home_team: FC Home", output)
+        self.assertIn("SendGrid error: 400", output)
+
+
+if __name__ == "__main__":
+    unittest.main()